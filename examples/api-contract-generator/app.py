@@ -7,10 +7,24 @@ This service generates API contracts and related artifacts from simple API descr
 - API documentation
 """
 
+import asyncio
+import hashlib
+import io
 import json
+import os
+import threading
+from collections import OrderedDict
+import orjson
 import yaml
 from datetime import datetime
+from typing import BinaryIO
 from dotenv import load_dotenv
+from jinja2 import Environment
+
+try:
+    from yaml import CSafeDumper as YamlDumper  # libyaml C emitter
+except ImportError:
+    from yaml import SafeDumper as YamlDumper
 
 from praisonai_svc import ServiceApp
 
@@ -21,12 +35,52 @@ load_dotenv()
 app = ServiceApp("API Contract Generator Service")
 
 
-def generate_openapi(api_desc: dict) -> str:
-    """Generate OpenAPI 3.0 specification."""
+# Maps path separators to underscores when deriving client method names
+_FUNC_NAME = str.maketrans("/-", "__")
+
+
+def _json_indent(value) -> bytes:
+    """Encode a value as indented UTF-8 JSON.
+
+    orjson rejects integers wider than 64 bits and lone surrogates, so those
+    values go through the stdlib encoder instead, which escapes non-ASCII text.
+    """
+    try:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    except orjson.JSONEncodeError:
+        return json.dumps(value, indent=2).encode()
+
+
+def prepare_endpoints(api_desc: dict) -> list[dict]:
+    """Resolve the per-endpoint fields used by the generators in a single pass."""
+    prepared = []
+    for endpoint in api_desc.get("endpoints", []):
+        method = endpoint.get("method", "GET")
+        path = endpoint.get("path", "/")
+        func_name = path.strip("/").translate(_FUNC_NAME) or "root"
+        prepared.append({
+            "method": method,
+            "verb": method.lower(),
+            "path": path,
+            "summary": endpoint.get("summary", f"{method.upper()} {path}"),
+            "func_name": func_name,
+            "func_name_camel": "".join(word.capitalize() for word in func_name.split("_")),
+            "returns": endpoint.get("returns", "object"),
+            "body_schema": endpoint.get("body_schema", {}),
+            "body_example": endpoint.get("body_example", {}),
+            "response_example": endpoint.get("response_example", {"status": "success"}),
+        })
+    return prepared
+
+
+def generate_openapi(api_desc: dict, stream: BinaryIO | None = None) -> str | None:
+    """Generate OpenAPI 3.0 specification.
+
+    Returns the YAML as a string, or writes it UTF-8 encoded to ``stream`` if given.
+    """
     api_name = api_desc.get("name", "API")
     version = api_desc.get("version", "1.0.0")
     base_url = api_desc.get("base_url", "https://api.example.com")
-    endpoints = api_desc.get("endpoints", [])
     
     openapi_spec = {
         "openapi": "3.0.0",
@@ -39,24 +93,19 @@ def generate_openapi(api_desc: dict) -> str:
         "paths": {}
     }
     
-    for endpoint in endpoints:
-        method = endpoint.get("method", "GET").lower()
-        path = endpoint.get("path", "/")
-        summary = endpoint.get("summary", f"{method.upper()} {path}")
-        returns = endpoint.get("returns", "object")
-        
-        if path not in openapi_spec["paths"]:
-            openapi_spec["paths"][path] = {}
+    paths = openapi_spec["paths"]
+    for endpoint in prepare_endpoints(api_desc):
+        verb = endpoint["verb"]
         
         operation = {
-            "summary": summary,
+            "summary": endpoint["summary"],
             "responses": {
                 "200": {
                     "description": "Successful response",
                     "content": {
                         "application/json": {
                             "schema": {
-                                "type": "array" if returns == "list" else "object"
+                                "type": "array" if endpoint["returns"] == "list" else "object"
                             }
                         }
                     }
@@ -64,28 +113,34 @@ def generate_openapi(api_desc: dict) -> str:
             }
         }
         
-        if method == "post" or method == "put":
+        if verb == "post" or verb == "put":
             operation["requestBody"] = {
                 "required": True,
                 "content": {
                     "application/json": {
                         "schema": {
                             "type": "object",
-                            "properties": endpoint.get("body_schema", {})
+                            "properties": endpoint["body_schema"]
                         }
                     }
                 }
             }
         
-        openapi_spec["paths"][path][method] = operation
+        paths.setdefault(endpoint["path"], {})[verb] = operation
     
-    return yaml.dump(openapi_spec, default_flow_style=False)
+    dump_options = {"Dumper": YamlDumper, "default_flow_style": False, "sort_keys": False}
+    if stream is None:
+        return yaml.dump(openapi_spec, **dump_options)
+    yaml.dump(openapi_spec, stream, encoding="utf-8", **dump_options)
+    return None
 
 
 def generate_postman_collection(api_desc: dict) -> dict:
     """Generate Postman collection."""
     api_name = api_desc.get("name", "API")
-    endpoints = api_desc.get("endpoints", [])
+    base_url = api_desc.get("base_url", "https://api.example.com")
+    # Resolved once per collection; tolerates base URLs given without a scheme
+    base_host = base_url.split("//", 1)[-1].split("/", 1)[0]
     
     collection = {
         "info": {
@@ -95,10 +150,10 @@ def generate_postman_collection(api_desc: dict) -> dict:
         "item": []
     }
     
-    for endpoint in endpoints:
-        method = endpoint.get("method", "GET")
-        path = endpoint.get("path", "/")
-        base_url = api_desc.get("base_url", "https://api.example.com")
+    for endpoint in prepare_endpoints(api_desc):
+        method = endpoint["method"]
+        path = endpoint["path"]
+        path_parts = path.strip("/").split("/")
         
         item = {
             "name": f"{method} {path}",
@@ -107,8 +162,8 @@ def generate_postman_collection(api_desc: dict) -> dict:
                 "header": [],
                 "url": {
                     "raw": f"{base_url}{path}",
-                    "host": [base_url.split("//")[1].split("/")[0]],
-                    "path": path.strip("/").split("/")
+                    "host": [base_host],
+                    "path": path_parts
                 }
             }
         }
@@ -116,7 +171,7 @@ def generate_postman_collection(api_desc: dict) -> dict:
         if method in ["POST", "PUT", "PATCH"]:
             item["request"]["body"] = {
                 "mode": "raw",
-                "raw": json.dumps(endpoint.get("body_example", {}), indent=2),
+                "raw": _json_indent(endpoint["body_example"]).decode(),
                 "options": {
                     "raw": {
                         "language": "json"
@@ -129,181 +184,204 @@ def generate_postman_collection(api_desc: dict) -> dict:
     return collection
 
 
-def generate_python_client(api_desc: dict) -> str:
-    """Generate Python client SDK."""
-    api_name = api_desc.get("name", "API").replace(" ", "")
-    base_url = api_desc.get("base_url", "https://api.example.com")
-    endpoints = api_desc.get("endpoints", [])
-    
-    code = f'''"""Generated Python client for {api_desc.get("name", "API")}."""
+# Client method name prefix and whether a request body is sent, per HTTP verb
+_CLIENT_METHODS = {
+    "get": ("get", False),
+    "post": ("create", True),
+    "put": ("update", True),
+    "delete": ("delete", False),
+}
+
+_PY_CLIENT_SRC = '''"""Generated Python client for {{ title }}."""
 
 import requests
 
-class {api_name}Client:
-    """Client for {api_desc.get("name", "API")} API."""
+class {{ api_name }}Client:
+    """Client for {{ title }} API."""
     
-    def __init__(self, base_url: str = "{base_url}"):
+    def __init__(self, base_url: str = "{{ base_url }}"):
         self.base_url = base_url
         self.session = requests.Session()
     
-'''
-    
-    for endpoint in endpoints:
-        method = endpoint.get("method", "GET").lower()
-        path = endpoint.get("path", "/")
-        func_name = path.strip("/").replace("/", "_").replace("-", "_") or "root"
-        
-        if method == "get":
-            code += f'''    def get_{func_name}(self):
-        """{endpoint.get("summary", f"GET {path}")}"""
-        response = self.session.get(f"{{self.base_url}}{path}")
+{% for endpoint in endpoints if endpoint.verb in client_methods %}
+{% set prefix, sends_body = client_methods[endpoint.verb] %}
+    def {{ prefix }}_{{ endpoint.func_name }}(self{{ ", data: dict" if sends_body }}):
+        """{{ endpoint.summary }}"""
+        response = self.session.{{ endpoint.verb }}(f"{self.base_url}{{ endpoint.path }}"{{ ", json=data" if sends_body }})
         response.raise_for_status()
         return response.json()
     
+{% endfor %}
 '''
-        elif method == "post":
-            code += f'''    def create_{func_name}(self, data: dict):
-        """{endpoint.get("summary", f"POST {path}")}"""
-        response = self.session.post(f"{{self.base_url}}{path}", json=data)
-        response.raise_for_status()
-        return response.json()
-    
-'''
-        elif method == "put":
-            code += f'''    def update_{func_name}(self, data: dict):
-        """{endpoint.get("summary", f"PUT {path}")}"""
-        response = self.session.put(f"{{self.base_url}}{path}", json=data)
-        response.raise_for_status()
-        return response.json()
-    
-'''
-        elif method == "delete":
-            code += f'''    def delete_{func_name}(self):
-        """{endpoint.get("summary", f"DELETE {path}")}"""
-        response = self.session.delete(f"{{self.base_url}}{path}")
-        response.raise_for_status()
-        return response.json()
-    
-'''
-    
-    return code
 
+_JS_CLIENT_SRC = '''// Generated JavaScript client for {{ title }}
 
-def generate_javascript_client(api_desc: dict) -> str:
-    """Generate JavaScript client SDK."""
-    api_name = api_desc.get("name", "API").replace(" ", "")
-    base_url = api_desc.get("base_url", "https://api.example.com")
-    endpoints = api_desc.get("endpoints", [])
-    
-    code = f'''// Generated JavaScript client for {api_desc.get("name", "API")}
-
-class {api_name}Client {{
-    constructor(baseUrl = "{base_url}") {{
+class {{ api_name }}Client {
+    constructor(baseUrl = "{{ base_url }}") {
         this.baseUrl = baseUrl;
-    }}
+    }
     
-    async request(method, path, data = null) {{
-        const options = {{
+    async request(method, path, data = null) {
+        const options = {
             method,
-            headers: {{ "Content-Type": "application/json" }}
-        }};
+            headers: { "Content-Type": "application/json" }
+        };
         
-        if (data) {{
+        if (data) {
             options.body = JSON.stringify(data);
-        }}
+        }
         
-        const response = await fetch(`${{this.baseUrl}}${{path}}`, options);
-        if (!response.ok) {{
-            throw new Error(`HTTP error! status: ${{response.status}}`);
-        }}
+        const response = await fetch(`${this.baseUrl}${path}`, options);
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
         return await response.json();
-    }}
-    
-'''
-    
-    for endpoint in endpoints:
-        method = endpoint.get("method", "GET").lower()
-        path = endpoint.get("path", "/")
-        func_name = path.strip("/").replace("/", "_").replace("-", "_") or "root"
-        func_name_camel = "".join(word.capitalize() for word in func_name.split("_")) if func_name != "root" else "Root"
-        
-        if method == "get":
-            code += f'''    async get{func_name_camel}() {{
-        return this.request("GET", "{path}");
-    }}
-    
-'''
-        elif method == "post":
-            code += f'''    async create{func_name_camel}(data) {{
-        return this.request("POST", "{path}", data);
-    }}
+    }
     
-'''
+{% for endpoint in endpoints if endpoint.verb in client_methods %}
+{% set prefix, sends_body = client_methods[endpoint.verb] %}
+    async {{ prefix }}{{ endpoint.func_name_camel }}({{ "data" if sends_body }}) {
+        return this.request("{{ endpoint.verb|upper }}", "{{ endpoint.path }}"{{ ", data" if sends_body }});
+    }
     
-    code += "}\n\nexport default " + api_name + "Client;"
-    return code
+{% endfor %}
+}
 
+export default {{ api_name }}Client;'''
 
-def generate_api_docs(api_desc: dict) -> str:
-    """Generate Markdown API documentation."""
-    api_name = api_desc.get("name", "API")
-    description = api_desc.get("description", f"{api_name} API documentation")
-    base_url = api_desc.get("base_url", "https://api.example.com")
-    endpoints = api_desc.get("endpoints", [])
-    
-    docs = f"""# {api_name} API Documentation
+_API_DOCS_SRC = '''# {{ title }} API Documentation
 
-{description}
+{{ description }}
 
 ## Base URL
 
 ```
-{base_url}
+{{ base_url }}
 ```
 
 ## Endpoints
 
-"""
-    
-    for endpoint in endpoints:
-        method = endpoint.get("method", "GET")
-        path = endpoint.get("path", "/")
-        summary = endpoint.get("summary", f"{method} {path}")
-        
-        docs += f"""### {method} {path}
+{% for endpoint in endpoints %}
+### {{ endpoint.method }} {{ endpoint.path }}
 
-{summary}
+{{ endpoint.summary }}
 
 **Request:**
 ```http
-{method} {base_url}{path}
+{{ endpoint.method }} {{ base_url }}{{ endpoint.path }}
 ```
 
-"""
-        
-        if method in ["POST", "PUT", "PATCH"]:
-            body_example = endpoint.get("body_example", {})
-            docs += f"""**Request Body:**
+{% if endpoint.method in ["POST", "PUT", "PATCH"] %}
+**Request Body:**
 ```json
-{json.dumps(body_example, indent=2)}
+{{ endpoint.body_example|json_indent }}
 ```
 
-"""
-        
-        response_example = endpoint.get("response_example", {"status": "success"})
-        docs += f"""**Response:**
+{% endif %}
+**Response:**
 ```json
-{json.dumps(response_example, indent=2)}
+{{ endpoint.response_example|json_indent }}
 ```
 
 ---
-"""
+{% endfor %}
+'''
+
+# Templates are compiled once at import and reused for every job
+_ENV = Environment(
+    trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True, autoescape=False
+)
+_ENV.filters["json_indent"] = lambda value: json.dumps(value, indent=2)
+_ENV.globals["client_methods"] = _CLIENT_METHODS
+
+_PY_CLIENT_TPL = _ENV.from_string(_PY_CLIENT_SRC)
+_JS_CLIENT_TPL = _ENV.from_string(_JS_CLIENT_SRC)
+_API_DOCS_TPL = _ENV.from_string(_API_DOCS_SRC)
+
+
+def generate_python_client(api_desc: dict) -> str:
+    """Generate Python client SDK."""
+    return _PY_CLIENT_TPL.render(
+        title=api_desc.get("name", "API"),
+        api_name=api_desc.get("name", "API").replace(" ", ""),
+        base_url=api_desc.get("base_url", "https://api.example.com"),
+        endpoints=prepare_endpoints(api_desc),
+    )
+
+
+def generate_javascript_client(api_desc: dict) -> str:
+    """Generate JavaScript client SDK."""
+    return _JS_CLIENT_TPL.render(
+        title=api_desc.get("name", "API"),
+        api_name=api_desc.get("name", "API").replace(" ", ""),
+        base_url=api_desc.get("base_url", "https://api.example.com"),
+        endpoints=prepare_endpoints(api_desc),
+    )
+
+
+def generate_api_docs(api_desc: dict) -> str:
+    """Generate Markdown API documentation."""
+    api_name = api_desc.get("name", "API")
+    return _API_DOCS_TPL.render(
+        title=api_name,
+        description=api_desc.get("description", f"{api_name} API documentation"),
+        base_url=api_desc.get("base_url", "https://api.example.com"),
+        endpoints=prepare_endpoints(api_desc),
+    )
+
+
+# Translation table for turning API names into filename-safe tokens
+_SANITIZE = str.maketrans(" ", "_")
+
+
+def _file_timestamp() -> str:
+    """Format the current UTC time as YYYYMMDD_HHMMSS without strftime."""
+    now = datetime.utcnow()
+    return f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+
+
+# Rendered contracts keyed by a hash of (api_desc, format), least recently used first
+CONTRACT_CACHE_SIZE = 128
+_CONTRACT_CACHE: OrderedDict[bytes, tuple[bytes, str, str, str]] = OrderedDict()
+_CONTRACT_CACHE_LOCK = threading.Lock()
+
+
+def _render_contract(api_desc: dict, format_type: str) -> tuple[bytes, str, str, str]:
+    """Render one contract artifact.
+
+    Returns:
+        tuple of (file_data, content_type, filename_prefix, extension)
+    """
+    api_name = api_desc.get("name", "API").translate(_SANITIZE)
+    
+    if format_type == "openapi":
+        buf = io.BytesIO()
+        generate_openapi(api_desc, buf)
+        return buf.getvalue(), "application/yaml", f"{api_name}_openapi", "yaml"
     
-    return docs
+    elif format_type == "postman":
+        collection = generate_postman_collection(api_desc)
+        file_data = _json_indent(collection)
+        return file_data, "application/json", f"{api_name}_postman", "json"
+    
+    elif format_type == "python":
+        content = generate_python_client(api_desc)
+        return content.encode('utf-8'), "text/x-python", f"{api_name}_client", "py"
+    
+    elif format_type == "javascript":
+        content = generate_javascript_client(api_desc)
+        return content.encode('utf-8'), "application/javascript", f"{api_name}_client", "js"
+    
+    elif format_type == "docs":
+        content = generate_api_docs(api_desc)
+        return content.encode('utf-8'), "text/markdown", f"{api_name}_docs", "md"
+    
+    else:
+        raise ValueError(f"Unsupported format: {format_type}. Supported: openapi, postman, python, javascript, docs")
 
 
 @app.job
-def generate_contract(payload: dict) -> tuple[bytes, str, str]:
+async def generate_contract(payload: dict) -> tuple[bytes, str, str]:
     """Generate API contract artifacts from API description.
 
     Args:
@@ -334,41 +412,29 @@ def generate_contract(payload: dict) -> tuple[bytes, str, str]:
     if not api_desc:
         raise ValueError("API description is required in payload")
     
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    api_name = api_desc.get("name", "API").replace(" ", "_")
-    
-    if format_type == "openapi":
-        content = generate_openapi(api_desc)
-        file_data = content.encode('utf-8')
-        content_type = "application/yaml"
-        filename = f"{api_name}_openapi_{timestamp}.yaml"
-    
-    elif format_type == "postman":
-        collection = generate_postman_collection(api_desc)
-        file_data = json.dumps(collection, indent=2).encode('utf-8')
-        content_type = "application/json"
-        filename = f"{api_name}_postman_{timestamp}.json"
-    
-    elif format_type == "python":
-        content = generate_python_client(api_desc)
-        file_data = content.encode('utf-8')
-        content_type = "text/x-python"
-        filename = f"{api_name}_client_{timestamp}.py"
-    
-    elif format_type == "javascript":
-        content = generate_javascript_client(api_desc)
-        file_data = content.encode('utf-8')
-        content_type = "application/javascript"
-        filename = f"{api_name}_client_{timestamp}.js"
-    
-    elif format_type == "docs":
-        content = generate_api_docs(api_desc)
-        file_data = content.encode('utf-8')
-        content_type = "text/markdown"
-        filename = f"{api_name}_docs_{timestamp}.md"
-    
-    else:
-        raise ValueError(f"Unsupported format: {format_type}. Supported: openapi, postman, python, javascript, docs")
+    # Identical descriptions (retries, several formats of one API) reuse earlier output
+    try:
+        encoded = orjson.dumps(api_desc, option=orjson.OPT_SORT_KEYS)
+    except orjson.JSONEncodeError:
+        # orjson only handles 64-bit integers; the stdlib encoder has no limit
+        encoded = json.dumps(api_desc, sort_keys=True).encode()
+    key = hashlib.blake2b(encoded + format_type.encode()).digest()
+    with _CONTRACT_CACHE_LOCK:
+        cached = _CONTRACT_CACHE.get(key)
+        if cached is not None:
+            _CONTRACT_CACHE.move_to_end(key)
+    
+    if cached is None:
+        # Render off the worker's event loop so queue and storage I/O keep flowing
+        cached = await asyncio.to_thread(_render_contract, api_desc, format_type)
+        with _CONTRACT_CACHE_LOCK:
+            _CONTRACT_CACHE[key] = cached
+            if len(_CONTRACT_CACHE) > CONTRACT_CACHE_SIZE:
+                _CONTRACT_CACHE.popitem(last=False)
+    
+    # The filename always carries the time of this job, even on a cache hit
+    file_data, content_type, filename_prefix, extension = cached
+    filename = f"{filename_prefix}_{_file_timestamp()}.{extension}"
     
     return file_data, content_type, filename
 
@@ -376,11 +442,21 @@ def generate_contract(payload: dict) -> tuple[bytes, str, str]:
 # Add direct download endpoint for local testing (bypasses SAS URL issues with Azurite)
 fastapi_app = app.get_app()
 
+# Media type served for each output file extension
+_MEDIA_TYPES = {
+    ".yaml": "application/yaml",
+    ".yml": "application/yaml",
+    ".json": "application/json",
+    ".py": "text/x-python",
+    ".js": "application/javascript",
+    ".md": "text/markdown",
+}
+
 @fastapi_app.get("/jobs/{job_id}/content")
 async def get_job_content(job_id: str):
     """Get job result content directly (for local testing with Azurite)."""
     from fastapi import HTTPException
-    from fastapi.responses import Response
+    from fastapi.responses import StreamingResponse
     from praisonai_svc.models import JobStatus
     
     job = await app.table_storage.get_job(job_id)
@@ -393,28 +469,13 @@ async def get_job_content(job_id: str):
     if not job.BlobName:
         raise HTTPException(status_code=500, detail="Blob name not found")
     
-    # Download blob content directly
-    blob_client = app.blob_storage.client.get_blob_client(
-        container=app.blob_storage.container_name,
-        blob=job.BlobName
-    )
-    content = blob_client.download_blob().readall()
-    
     # Determine content type from filename
-    if job.BlobName.endswith('.yaml') or job.BlobName.endswith('.yml'):
-        media_type = "application/yaml"
-    elif job.BlobName.endswith('.json'):
-        media_type = "application/json"
-    elif job.BlobName.endswith('.py'):
-        media_type = "text/x-python"
-    elif job.BlobName.endswith('.js'):
-        media_type = "application/javascript"
-    elif job.BlobName.endswith('.md'):
-        media_type = "text/markdown"
-    else:
-        media_type = "application/octet-stream"
+    extension = os.path.splitext(job.BlobName)[1].lower()
+    media_type = _MEDIA_TYPES.get(extension, "application/octet-stream")
     
-    return Response(content=content, media_type=media_type)
+    # Stream blob content directly, one chunk at a time
+    chunks = await app.blob_storage.open_blob_chunks(job.BlobName)
+    return StreamingResponse(chunks, media_type=media_type)
 
 
 if __name__ == "__main__":
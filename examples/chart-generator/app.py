@@ -9,7 +9,11 @@ This service generates charts from data:
 - Multiple chart formats (PNG, SVG, PDF)
 """
 
+import asyncio
 import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -18,6 +22,13 @@ try:
     matplotlib.use('Agg')  # Use non-interactive backend
     import matplotlib.pyplot as plt
     import matplotlib.patches as mpatches
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    try:
+        from matplotlib.style import _STYLE_BLACKLIST as STYLE_BLACKLIST  # matplotlib >= 3.11
+    except ImportError:
+        from matplotlib.style.core import STYLE_BLACKLIST
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
@@ -36,16 +47,94 @@ config.poison_queue_name = "chart-generator-jobs-poison"
 app = ServiceApp("Chart Generator Service", config=config)
 
 
-def create_chart(data: dict, chart_type: str, options: dict) -> io.BytesIO:
+# Chart renders run here so they never block the worker's event loop
+CHART_POOL = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# Per-thread figure reused across jobs, bound to an Agg canvas once
+_figure_local = threading.local()
+
+# rcParams for each supported style, resolved on first use
+# (unknown styles render as "default", so this stays at most three entries)
+_STYLES = ("default", "dark", "seaborn")
+_STYLE_PARAMS: dict[str, dict] = {}
+
+
+def _get_figure() -> "Figure":
+    """Return this thread's reusable figure, creating it on first use."""
+    fig = getattr(_figure_local, "figure", None)
+    if fig is None:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        _figure_local.figure = fig
+    return fig
+
+
+def _style_params(style: str) -> dict:
+    """Return the full rcParams for a chart style, applied via rc_context."""
+    if style not in _STYLES:
+        style = "default"
+    params = _STYLE_PARAMS.get(style)
+    if params is None:
+        params = {
+            key: value
+            for key, value in matplotlib.rcParamsDefault.items()
+            if key not in STYLE_BLACKLIST
+        }
+        if style == "dark":
+            params.update(matplotlib.style.library["dark_background"])
+        elif style == "seaborn":
+            library = matplotlib.style.library
+            params.update(library.get("seaborn-v0_8", library.get("seaborn", {})))
+        _STYLE_PARAMS[style] = params
+    return params
+
+
+def _save_tight_png(fig: "Figure", output: io.BytesIO) -> None:
+    """Write the figure as PNG, cropped like bbox_inches='tight', from a single draw.
+
+    savefig(bbox_inches='tight') lays the figure out once to measure it and then
+    renders it again; here the Agg buffer from one draw is cropped instead. That
+    only works while the tight box lies on the canvas: artists reaching past the
+    figure edge (e.g. an over-wide title) need savefig's larger re-render.
+    """
+    canvas = fig.canvas
+    canvas.draw()
+    dpi = fig.dpi
+    pad = matplotlib.rcParams["savefig.pad_inches"]
+    bbox = fig.get_tightbbox(canvas.get_renderer()).padded(pad)
+    
+    fig_width, fig_height = fig.get_size_inches()
+    if bbox.x0 < 0 or bbox.y0 < 0 or bbox.x1 > fig_width or bbox.y1 > fig_height:
+        fig.savefig(output, format="png", dpi=dpi, bbox_inches='tight')
+        return
+    
+    pixels = np.asarray(canvas.buffer_rgba())
+    height, width = pixels.shape[:2]
+    # Truncate to whole pixels as savefig does (absorbing float error in the
+    # padded size); buffer rows count down from the top
+    left, y0 = np.rint(bbox.p0 * dpi).astype(int)
+    crop_width, crop_height = (bbox.size * dpi + 1e-6).astype(int)
+    bottom = min(height - y0, height)
+    top = max(bottom - crop_height, 0)
+    left = max(left, 0)
+    right = min(left + crop_width, width)
+    
+    matplotlib.image.imsave(output, pixels[top:bottom, left:right], format="png", dpi=dpi)
+
+
+def create_chart(
+    data: dict, chart_type: str, options: dict, output_format: str = "png"
+) -> io.BytesIO:
     """Create a chart from data.
     
     Args:
         data: Chart data containing labels and values
         chart_type: Type of chart (line, bar, pie, scatter, area)
         options: Chart options (title, colors, size, etc.)
+        output_format: Output format (png, svg, pdf) - default: png
     
     Returns:
-        BytesIO object containing the chart image
+        BytesIO object containing the chart in the requested format
     """
     if not MATPLOTLIB_AVAILABLE:
         raise ValueError("Matplotlib library is required. Install with: pip install matplotlib")
@@ -62,120 +151,132 @@ def create_chart(data: dict, chart_type: str, options: dict) -> io.BytesIO:
     width = options.get("width", 10)
     height = options.get("height", 6)
     dpi = options.get("dpi", 100)
-    colors = options.get("colors", None)
+    colors = options.get("colors") or None
     style = options.get("style", "default")
     
-    # Set style
-    if style == "dark":
-        plt.style.use("dark_background")
-    elif style == "seaborn":
-        try:
-            plt.style.use("seaborn-v0_8")
-        except:
-            plt.style.use("seaborn")
-    else:
-        plt.style.use("default")
-    
-    # Create figure
-    fig, ax = plt.subplots(figsize=(width, height), dpi=dpi)
-    
-    # Generate colors if not provided
-    if colors is None:
-        if chart_type == "pie":
-            colors = plt.cm.Set3(range(len(values)))
-        else:
-            colors = plt.cm.tab10(range(len(datasets) if datasets else 1))
-    
-    # Create chart based on type
-    if chart_type == "line":
-        if datasets:
-            for i, dataset in enumerate(datasets):
-                dataset_labels = dataset.get("labels", labels)
-                dataset_values = dataset.get("values", [])
-                dataset_label = dataset.get("label", f"Series {i+1}")
-                ax.plot(dataset_labels, dataset_values, marker='o', label=dataset_label, 
-                       color=colors[i % len(colors)] if isinstance(colors, list) else colors)
-        else:
-            ax.plot(labels, values, marker='o', color=colors[0] if isinstance(colors, list) else colors)
-        ax.grid(True, alpha=0.3)
-    
-    elif chart_type == "bar":
-        if datasets:
-            x = range(len(labels))
-            width_bar = 0.8 / len(datasets)
-            for i, dataset in enumerate(datasets):
-                dataset_values = dataset.get("values", [])
-                dataset_label = dataset.get("label", f"Series {i+1}")
-                offset = (i - len(datasets)/2 + 0.5) * width_bar
-                ax.bar([xi + offset for xi in x], dataset_values, width_bar, 
-                      label=dataset_label, color=colors[i % len(colors)] if isinstance(colors, list) else colors)
-            ax.set_xticks(x)
-            ax.set_xticklabels(labels)
-        else:
-            ax.bar(labels, values, color=colors[0] if isinstance(colors, list) else colors)
-        ax.grid(True, alpha=0.3, axis='y')
-    
-    elif chart_type == "pie":
-        if not labels or not values:
-            raise ValueError("Labels and values are required for pie chart")
-        wedges, texts, autotexts = ax.pie(values, labels=labels, autopct='%1.1f%%', 
-                                          colors=colors, startangle=90)
-        ax.axis('equal')
-    
-    elif chart_type == "scatter":
-        if datasets:
-            for i, dataset in enumerate(datasets):
-                x_data = dataset.get("x", labels)
-                y_data = dataset.get("y", dataset.get("values", values))
-                dataset_label = dataset.get("label", f"Series {i+1}")
-                ax.scatter(x_data, y_data, label=dataset_label, 
-                          color=colors[i % len(colors)] if isinstance(colors, list) else colors,
-                          alpha=0.6, s=100)
+    fig = _get_figure()
+    
+    with matplotlib.rc_context(_style_params(style)):
+        # Reset the reused figure and pick up the style's figure colors
+        fig.clear()
+        fig.set_size_inches(width, height)
+        fig.set_dpi(dpi)
+        fig.set_facecolor(matplotlib.rcParams["figure.facecolor"])
+        fig.set_edgecolor(matplotlib.rcParams["figure.edgecolor"])
+        ax = fig.add_subplot(111)
+        
+        # Generate colors if not provided
+        if colors is None:
+            # Integer arrays index the listed colormaps' entries in one vectorized call
+            if chart_type == "pie":
+                colors = plt.cm.Set3(np.arange(len(values)))
+            else:
+                colors = plt.cm.tab10(np.arange(len(datasets) if datasets else 1))
+        
+        # One color per series: a single color is broadcast, palettes are cycled
+        if matplotlib.colors.is_color_like(colors):
+            color_list = [colors]
         else:
-            if len(labels) == len(values):
-                ax.scatter(labels, values, color=colors[0] if isinstance(colors, list) else colors, 
-                          alpha=0.6, s=100)
+            color_list = list(colors)
+        
+        # Create chart based on type
+        if chart_type == "line":
+            if datasets:
+                for i, dataset in enumerate(datasets):
+                    dataset_labels = dataset.get("labels", labels)
+                    dataset_values = dataset.get("values", [])
+                    dataset_label = dataset.get("label", f"Series {i+1}")
+                    ax.plot(dataset_labels, dataset_values, marker='o', label=dataset_label, 
+                           color=color_list[i % len(color_list)])
             else:
-                raise ValueError("Labels and values must have the same length for scatter plot")
-        ax.grid(True, alpha=0.3)
-    
-    elif chart_type == "area":
-        if datasets:
-            ax.stackplot(labels, *[d.get("values", []) for d in datasets], 
-                        labels=[d.get("label", f"Series {i+1}") for i, d in enumerate(datasets)],
-                        colors=colors if isinstance(colors, list) else [colors] * len(datasets),
-                        alpha=0.7)
+                ax.plot(labels, values, marker='o', color=color_list[0])
+            ax.grid(True, alpha=0.3)
+        
+        elif chart_type == "bar":
+            if datasets:
+                x = np.arange(len(labels))
+                width_bar = 0.8 / len(datasets)
+                for i, dataset in enumerate(datasets):
+                    dataset_values = np.asarray(dataset.get("values", []))
+                    dataset_label = dataset.get("label", f"Series {i+1}")
+                    offset = (i - len(datasets)/2 + 0.5) * width_bar
+                    ax.bar(x + offset, dataset_values, width_bar, 
+                          label=dataset_label, color=color_list[i % len(color_list)])
+                ax.set_xticks(x)
+                ax.set_xticklabels(labels)
+            else:
+                ax.bar(labels, values, color=color_list[0])
+            ax.grid(True, alpha=0.3, axis='y')
+        
+        elif chart_type == "pie":
+            if not labels or not values:
+                raise ValueError("Labels and values are required for pie chart")
+            wedges, texts, autotexts = ax.pie(values, labels=labels, autopct='%1.1f%%', 
+                                              colors=color_list, startangle=90)
+            ax.axis('equal')
+        
+        elif chart_type == "scatter":
+            if datasets:
+                for i, dataset in enumerate(datasets):
+                    x_data = dataset.get("x", labels)
+                    y_data = dataset.get("y", dataset.get("values", values))
+                    dataset_label = dataset.get("label", f"Series {i+1}")
+                    ax.scatter(x_data, y_data, label=dataset_label, 
+                              color=color_list[i % len(color_list)],
+                              alpha=0.6, s=100)
+            else:
+                if len(labels) == len(values):
+                    ax.scatter(labels, values, color=color_list[0], 
+                              alpha=0.6, s=100)
+                else:
+                    raise ValueError("Labels and values must have the same length for scatter plot")
+            ax.grid(True, alpha=0.3)
+        
+        elif chart_type == "area":
+            if datasets:
+                ax.stackplot(labels, *[d.get("values", []) for d in datasets], 
+                            labels=[d.get("label", f"Series {i+1}") for i, d in enumerate(datasets)],
+                            colors=[color_list[i % len(color_list)] for i in range(len(datasets))],
+                            alpha=0.7)
+            else:
+                ax.fill_between(labels, values, alpha=0.7, color=color_list[0])
+            ax.grid(True, alpha=0.3)
+        
         else:
-            ax.fill_between(labels, values, alpha=0.7, color=colors[0] if isinstance(colors, list) else colors)
-        ax.grid(True, alpha=0.3)
-    
-    else:
-        raise ValueError(f"Unsupported chart type: {chart_type}")
-    
-    # Set labels and title
-    if xlabel:
-        ax.set_xlabel(xlabel)
-    if ylabel:
-        ax.set_ylabel(ylabel)
-    ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
-    
-    # Add legend if multiple series
-    if datasets and len(datasets) > 1:
-        ax.legend(loc='best')
-    
-    # Adjust layout
-    plt.tight_layout()
-    
-    # Save to BytesIO
-    output = io.BytesIO()
-    fig.savefig(output, format='png', dpi=dpi, bbox_inches='tight')
-    plt.close(fig)
+            raise ValueError(f"Unsupported chart type: {chart_type}")
+        
+        # Set labels and title
+        if xlabel:
+            ax.set_xlabel(xlabel)
+        if ylabel:
+            ax.set_ylabel(ylabel)
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
+        
+        # Add legend if multiple series
+        if datasets and len(datasets) > 1:
+            ax.legend(loc='best')
+        
+        # Adjust layout
+        fig.tight_layout()
+        
+        output = io.BytesIO()
+        if output_format == "png":
+            _save_tight_png(fig, output)
+        else:
+            # savefig picks the SVG or PDF canvas for the format
+            fig.savefig(output, format=output_format, dpi=dpi, bbox_inches='tight')
     
     return output
 
 
+def _file_timestamp() -> str:
+    """Format the current UTC time as YYYYMMDD_HHMMSS without strftime."""
+    now = datetime.utcnow()
+    return f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+
+
 @app.job
-def generate_chart(payload: dict) -> tuple[bytes, str, str]:
+async def generate_chart(payload: dict) -> tuple[bytes, str, str]:
     """Generate chart from provided data.
 
     Args:
@@ -226,34 +327,25 @@ def generate_chart(payload: dict) -> tuple[bytes, str, str]:
     if chart_type not in supported_types:
         raise ValueError(f"Unsupported chart_type: {chart_type}. Supported: {', '.join(supported_types)}")
     
-    # Create chart
-    chart_output = create_chart(data, chart_type, options)
-    
-    # Handle different output formats
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    chart_type_name = chart_type.replace(" ", "_")
-    
     if output_format == "svg":
-        # For SVG, we need to recreate with SVG backend
-        import matplotlib
-        matplotlib.use('SVG')
-        import matplotlib.pyplot as plt
-        fig, ax = plt.subplots(figsize=(options.get("width", 10), options.get("height", 6)))
-        # Recreate chart logic for SVG (simplified)
-        # For now, convert PNG to SVG is complex, so we'll use PNG as base
-        # In production, you'd recreate the chart with SVG backend
-        file_data = chart_output.getvalue()
-        content_type = "image/png"  # Fallback to PNG
-        filename = f"chart_{chart_type_name}_{timestamp}.png"
+        content_type = "image/svg+xml"
     elif output_format == "pdf":
-        # Similar to SVG, would need PDF backend
-        file_data = chart_output.getvalue()
-        content_type = "image/png"  # Fallback to PNG
-        filename = f"chart_{chart_type_name}_{timestamp}.png"
+        content_type = "application/pdf"
     else:  # png (default)
-        file_data = chart_output.getvalue()
+        output_format = "png"
         content_type = "image/png"
-        filename = f"chart_{chart_type_name}_{timestamp}.png"
+    
+    # Create chart, rendered directly in the requested format
+    loop = asyncio.get_running_loop()
+    chart_output = await loop.run_in_executor(
+        CHART_POOL, create_chart, data, chart_type, options, output_format
+    )
+    
+    # chart_type is one of supported_types, so it is already filename-safe
+    timestamp = _file_timestamp()
+    
+    file_data = chart_output.getvalue()
+    filename = f"chart_{chart_type}_{timestamp}.{output_format}"
     
     return file_data, content_type, filename
 
@@ -261,11 +353,18 @@ def generate_chart(payload: dict) -> tuple[bytes, str, str]:
 # Add direct download endpoint for local testing
 fastapi_app = app.get_app()
 
+# Media type served for each output file extension
+_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+    ".pdf": "application/pdf",
+}
+
 @fastapi_app.get("/jobs/{job_id}/content")
 async def get_job_content(job_id: str):
     """Get job result content directly (for local testing with Azurite)."""
     from fastapi import HTTPException
-    from fastapi.responses import Response
+    from fastapi.responses import StreamingResponse
     from praisonai_svc.models import JobStatus
     
     job = await app.table_storage.get_job(job_id)
@@ -278,24 +377,13 @@ async def get_job_content(job_id: str):
     if not job.BlobName:
         raise HTTPException(status_code=500, detail="Blob name not found")
     
-    # Download blob content directly
-    blob_client = app.blob_storage.client.get_blob_client(
-        container=app.blob_storage.container_name,
-        blob=job.BlobName
-    )
-    content = blob_client.download_blob().readall()
-    
     # Determine content type from filename
-    if job.BlobName.endswith('.png'):
-        media_type = "image/png"
-    elif job.BlobName.endswith('.svg'):
-        media_type = "image/svg+xml"
-    elif job.BlobName.endswith('.pdf'):
-        media_type = "application/pdf"
-    else:
-        media_type = "image/png"
+    extension = os.path.splitext(job.BlobName)[1].lower()
+    media_type = _MEDIA_TYPES.get(extension, "image/png")
     
-    return Response(content=content, media_type=media_type)
+    # Stream blob content directly, one chunk at a time
+    chunks = await app.blob_storage.open_blob_chunks(job.BlobName)
+    return StreamingResponse(chunks, media_type=media_type)
 
 
 if __name__ == "__main__":
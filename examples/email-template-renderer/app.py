@@ -8,16 +8,28 @@ This service renders email templates with dynamic data:
 - Template inheritance
 """
 
+import hashlib
 import io
+import json
+import os
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Literal
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 try:
-    from jinja2 import Template, Environment, BaseLoader
+    from jinja2 import Template, Environment, BaseLoader, FileSystemBytecodeCache
     JINJA2_AVAILABLE = True
 except ImportError:
     JINJA2_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from praisonai_svc import ServiceApp
 
 # Load environment variables from .env file
@@ -29,7 +41,82 @@ config = ServiceConfig()
 config.queue_name = "email-template-jobs"
 config.poison_queue_name = "email-template-jobs-poison"
 
-app = ServiceApp("Email Template Renderer Service", config=config)
+
+class EmailTemplatePayload(BaseModel):
+    """Email template job payload, validated by POST /jobs before queueing."""
+
+    template: str = Field(min_length=1)
+    template_type: Literal["html", "text"] = "html"
+    data: dict[str, Any] = {}
+    subject: str = ""
+    output_format: Literal["html", "text", "json"] | None = None
+
+    @field_validator("template_type", "output_format", mode="before")
+    @classmethod
+    def _lowercase(cls, value: Any) -> Any:
+        return value.lower() if isinstance(value, str) else value
+
+    @model_validator(mode="after")
+    def _default_output_format(self) -> "EmailTemplatePayload":
+        if self.output_format is None:
+            self.output_format = self.template_type
+        return self
+
+
+app = ServiceApp("Email Template Renderer Service", config=config, payload_model=EmailTemplatePayload)
+
+# Shared Jinja2 environment, created once per worker instead of once per job.
+# Compiled template code is also kept on disk (in a per-user temp directory),
+# so restarted or additional worker processes skip recompiling known templates.
+_JINJA_ENV = Environment(
+    loader=BaseLoader(),
+    auto_reload=False,
+    bytecode_cache=FileSystemBytecodeCache(),
+) if JINJA2_AVAILABLE else None
+
+# Complete HTML document wrapped around rendered bodies when a subject is given
+_HTML_WRAPPER = _JINJA_ENV.from_string("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{ subject }}</title>
+</head>
+<body>
+{{ body }}
+</body>
+</html>""") if JINJA2_AVAILABLE else None
+
+
+@lru_cache(maxsize=256)
+def _get_template(template_content: str) -> "Template":
+    """Compile a template source once and reuse it for identical sources.
+
+    from_string() never consults the bytecode cache (only loaders do), so this
+    follows the same bucket protocol as BaseLoader.load, keyed by a hash of
+    the source.
+    """
+    bytecode_cache = _JINJA_ENV.bytecode_cache
+    name = hashlib.sha1(template_content.encode("utf-8")).hexdigest()
+    bucket = bytecode_cache.get_bucket(_JINJA_ENV, name, None, template_content)
+    if bucket.code is None:
+        bucket.code = _JINJA_ENV.compile(template_content)
+        bytecode_cache.set_bucket(bucket)
+    return _JINJA_ENV.template_class.from_code(_JINJA_ENV, bucket.code, _JINJA_ENV.make_globals(None), None)
+
+
+def _json_compact(value: dict) -> bytes:
+    """Encode a value as compact JSON.
+
+    orjson writes UTF-8 directly but rejects lone surrogates; without it, or
+    for such text, the stdlib encoder is used and escapes non-ASCII text.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(value, separators=(",", ":")).encode('ascii')
 
 
 @app.job
@@ -37,12 +124,12 @@ def render_email_template(payload: dict) -> tuple[bytes, str, str]:
     """Render email template with provided data.
 
     Args:
-        payload: Job payload containing:
+        payload: Job payload, as validated by EmailTemplatePayload:
             - template (str): Email template content (HTML or text)
             - template_type (str): Type of template (html, text) - default: html
             - data (dict): Variables to substitute in template
             - subject (str, optional): Email subject line
-            - output_format (str): Output format (html, text, json) - default: html
+            - output_format (str): Output format (html, text, json) - default: template_type
     
     Returns:
         tuple of (file_data, content_type, filename)
@@ -59,76 +146,60 @@ def render_email_template(payload: dict) -> tuple[bytes, str, str]:
     if not JINJA2_AVAILABLE:
         raise ValueError("Jinja2 library is required. Install with: pip install Jinja2")
     
-    # Extract parameters
-    template_content = payload.get("template", "")
-    template_type = payload.get("template_type", "html").lower()
-    data = payload.get("data", {})
-    subject = payload.get("subject", "")
-    output_format = payload.get("output_format", template_type).lower()
-    
-    # Validate this is an email template job, not a chart job
-    if "chart_type" in payload or ("data" in payload and "labels" in payload.get("data", {}) and "values" in payload.get("data", {})):
-        raise ValueError("This is a Chart Generator job. Please use the Chart Generator service (port 8083) instead of Email Template Renderer (port 8082).")
-    
-    if not template_content:
-        raise ValueError("template is required in payload")
-    
-    # Create Jinja2 environment
-    env = Environment(loader=BaseLoader())
+    # POST /jobs already validated the payload, but messages queued another
+    # way have not been; ValidationError is a ValueError, like other job errors
+    request = EmailTemplatePayload.model_validate(payload)
+    template_content = request.template
+    template_type = request.template_type
+    data = request.data
+    subject = request.subject
+    output_format = request.output_format
     
     # Render template
     try:
-        template = env.from_string(template_content)
+        template = _get_template(template_content)
         rendered_content = template.render(**data)
     except Exception as e:
         raise ValueError(f"Template rendering error: {str(e)}")
     
     # Prepare output based on format
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    # One clock read per job, formatted without strftime
+    now = datetime.utcnow()
+    timestamp = f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
     
     if output_format == "json":
         # Return as JSON with metadata
-        import json
         output_data = {
             "subject": subject,
             "body": rendered_content,
             "type": template_type,
-            "rendered_at": datetime.utcnow().isoformat()
+            "rendered_at": now.isoformat()
         }
-        file_data = json.dumps(output_data, indent=2).encode('utf-8')
+        file_data = _json_compact(output_data)
         content_type = "application/json"
         filename = f"email_template_{timestamp}.json"
     
     elif output_format == "text" or template_type == "text":
-        # Plain text email
+        # Plain text email, encoded piece by piece into one buffer
+        output = io.BytesIO()
         if subject:
-            full_content = f"Subject: {subject}\n\n{rendered_content}"
-        else:
-            full_content = rendered_content
-        file_data = full_content.encode('utf-8')
+            output.write(f"Subject: {subject}\n\n".encode('utf-8'))
+        output.write(rendered_content.encode('utf-8'))
+        file_data = output.getvalue()
         content_type = "text/plain"
         filename = f"email_template_{timestamp}.txt"
     
     else:
         # HTML email (default)
+        output = io.BytesIO()
         if subject:
-            # Create a complete HTML email structure
-            html_wrapper = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{subject}</title>
-</head>
-<body>
-{rendered_content}
-</body>
-</html>"""
-            full_content = html_wrapper
+            # Create a complete HTML email structure, streamed into the buffer
+            for chunk in _HTML_WRAPPER.generate(subject=subject, body=rendered_content):
+                output.write(chunk.encode('utf-8'))
         else:
-            full_content = rendered_content
+            output.write(rendered_content.encode('utf-8'))
         
-        file_data = full_content.encode('utf-8')
+        file_data = output.getvalue()
         content_type = "text/html"
         filename = f"email_template_{timestamp}.html"
     
@@ -138,11 +209,17 @@ def render_email_template(payload: dict) -> tuple[bytes, str, str]:
 # Add direct download endpoint for local testing
 fastapi_app = app.get_app()
 
+_MEDIA_TYPES = {
+    ".html": "text/html",
+    ".txt": "text/plain",
+    ".json": "application/json",
+}
+
 @fastapi_app.get("/jobs/{job_id}/content")
 async def get_job_content(job_id: str):
     """Get job result content directly (for local testing with Azurite)."""
     from fastapi import HTTPException
-    from fastapi.responses import Response
+    from fastapi.responses import StreamingResponse
     from praisonai_svc.models import JobStatus
     
     job = await app.table_storage.get_job(job_id)
@@ -155,24 +232,13 @@ async def get_job_content(job_id: str):
     if not job.BlobName:
         raise HTTPException(status_code=500, detail="Blob name not found")
     
-    # Download blob content directly
-    blob_client = app.blob_storage.client.get_blob_client(
-        container=app.blob_storage.container_name,
-        blob=job.BlobName
-    )
-    content = blob_client.download_blob().readall()
-    
     # Determine content type from filename
-    if job.BlobName.endswith('.html'):
-        media_type = "text/html"
-    elif job.BlobName.endswith('.txt'):
-        media_type = "text/plain"
-    elif job.BlobName.endswith('.json'):
-        media_type = "application/json"
-    else:
-        media_type = "application/octet-stream"
+    extension = os.path.splitext(job.BlobName)[1].lower()
+    media_type = _MEDIA_TYPES.get(extension, "application/octet-stream")
     
-    return Response(content=content, media_type=media_type)
+    # Stream blob content directly, one chunk at a time
+    chunks = await app.blob_storage.open_blob_chunks(job.BlobName)
+    return StreamingResponse(chunks, media_type=media_type)
 
 
 if __name__ == "__main__":
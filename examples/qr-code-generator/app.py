@@ -7,6 +7,8 @@ This service generates QR codes from text, URLs, or contact information:
 """
 
 import io
+import os
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -18,6 +20,12 @@ try:
 except ImportError:
     QRCODE_AVAILABLE = False
 
+try:
+    import segno
+    SEGNO_AVAILABLE = True
+except ImportError:
+    SEGNO_AVAILABLE = False
+
 from praisonai_svc import ServiceApp
 
 # Load environment variables from .env file
@@ -26,6 +34,93 @@ load_dotenv()
 # Initialize the service
 app = ServiceApp("QR Code Generator Service")
 
+# Map error correction levels
+_ERROR_MAP = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+} if QRCODE_AVAILABLE else {}
+
+# Per-thread QRCode instances, keyed by (error_level, border)
+_QR_POOL = threading.local()
+
+
+def _file_timestamp() -> str:
+    """Format the current UTC time as YYYYMMDD_HHMMSS without strftime."""
+    now = datetime.utcnow()
+    return f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+
+
+def _get_qr(error_level: int, border: int) -> "qrcode.QRCode":
+    """Return a cleared QRCode for this thread, reusing one per settings pair."""
+    pool = getattr(_QR_POOL, "instances", None)
+    if pool is None:
+        pool = _QR_POOL.instances = {}
+    
+    qr = pool.get((error_level, border))
+    if qr is None:
+        qr = pool[(error_level, border)] = qrcode.QRCode(
+            version=1,
+            error_correction=error_level,
+            box_size=10,
+            border=border,
+        )
+    else:
+        # make(fit=True) searches upwards from the current version, so it
+        # has to start from 1 again along with the cleared data
+        qr.clear()
+        qr.version = 1
+    return qr
+
+
+def _write_segno(output: io.BytesIO, data: str, output_format: str, size: int, error_correction: str,
+                 border: int, fill_color: str, back_color: str) -> None:
+    """Encode with segno, which writes PNG/SVG straight from the module matrix."""
+    # Regular (not micro) QR codes at exactly the requested level, like qrcode
+    error = error_correction if error_correction in ("L", "M", "Q", "H") else "M"
+    qr = segno.make(data, error=error, micro=False, boost_error=False)
+    # segno spells a transparent background as light=None
+    light = None if back_color.lower() == "transparent" else back_color
+    
+    if output_format == "svg":
+        # One millimetre per module, the same physical size qrcode's SvgImage uses
+        qr.save(output, kind="svg", scale=1, border=border, unit="mm", dark=fill_color, light=light)
+    else:
+        # Largest whole-module scale that fits the requested size (at least 1 px)
+        modules = qr.symbol_size(scale=1, border=border)[0]
+        qr.save(output, kind="png", scale=max(1, size // modules), border=border, dark=fill_color, light=light)
+
+
+def _write_qrcode(output: io.BytesIO, data: str, output_format: str, size: int, error_correction: str,
+                  border: int, fill_color: str, back_color: str) -> None:
+    """Encode with qrcode, drawing modules through Pillow."""
+    error_level = _ERROR_MAP.get(error_correction, qrcode.constants.ERROR_CORRECT_M)
+    
+    # Reuse this thread's QR code instance for these settings
+    qr = _get_qr(error_level, border)
+    
+    # Add data
+    qr.add_data(data)
+    qr.make(fit=True)
+    
+    if output_format == "svg":
+        try:
+            from qrcode.image.svg import SvgImage
+        except ImportError:
+            raise ValueError("SVG support requires qrcode[svg]. Install with: pip install qrcode[svg]")
+        qr.box_size = 10
+        img = qr.make_image(image_factory=SvgImage, fill_color=fill_color, back_color=back_color)
+        img.save(output)
+    else:
+        # Raster output is drawn directly at the largest whole-module box size
+        # that fits the requested size, so no resampling pass is needed
+        # (never below 1 px per module, even if that overshoots the size)
+        modules = qr.modules_count + 2 * border
+        qr.box_size = max(1, size // modules)
+        img = qr.make_image(fill_color=fill_color, back_color=back_color)
+        img.save(output, format="PNG")
+
 
 @app.job
 def generate_qrcode(payload: dict) -> tuple[bytes, str, str]:
@@ -35,7 +130,9 @@ def generate_qrcode(payload: dict) -> tuple[bytes, str, str]:
         payload: Job payload containing:
             - data (str): Data to encode (URL, text, contact info, etc.)
             - format (str): Output format (png, svg, pdf) - default: png
-            - size (int): QR code size in pixels (default: 300)
+            - size (int): Maximum QR code size in pixels (default: 300); modules are
+              at least 1 px, so a size below the module count (border included)
+              yields a larger image
             - error_correction (str): Error correction level (L, M, Q, H) - default: M
             - border (int): Border size in boxes (default: 4)
             - fill_color (str): Fill color hex code (default: "#000000")
@@ -52,8 +149,8 @@ def generate_qrcode(payload: dict) -> tuple[bytes, str, str]:
             "error_correction": "H"
         }
     """
-    if not QRCODE_AVAILABLE:
-        raise ValueError("qrcode library is required. Install with: pip install qrcode[pil]")
+    if not SEGNO_AVAILABLE and not QRCODE_AVAILABLE:
+        raise ValueError("segno or qrcode library is required. Install with: pip install segno")
     
     # Extract parameters
     data = payload.get("data", "")
@@ -67,68 +164,21 @@ def generate_qrcode(payload: dict) -> tuple[bytes, str, str]:
     if not data:
         raise ValueError("data is required in payload")
     
-    # Map error correction levels
-    error_map = {
-        "L": qrcode.constants.ERROR_CORRECT_L,
-        "M": qrcode.constants.ERROR_CORRECT_M,
-        "Q": qrcode.constants.ERROR_CORRECT_Q,
-        "H": qrcode.constants.ERROR_CORRECT_H,
-    }
-    
-    error_level = error_map.get(error_correction, qrcode.constants.ERROR_CORRECT_M)
-    
-    # Create QR code instance
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=error_level,
-        box_size=10,
-        border=border,
-    )
-    
-    # Add data
-    qr.add_data(data)
-    qr.make(fit=True)
-    
-    # Generate image
+    # segno writes images directly; qrcode is the fallback backend
     output = io.BytesIO()
+    write = _write_segno if SEGNO_AVAILABLE else _write_qrcode
+    write(output, data, output_format, size, error_correction, border, fill_color, back_color)
     
     if output_format == "svg":
-        # SVG format
-        try:
-            from qrcode.image.svg import SvgImage
-            img = qr.make_image(image_factory=SvgImage, fill_color=fill_color, back_color=back_color)
-            img.save(output)
-            content_type = "image/svg+xml"
-            extension = "svg"
-        except ImportError:
-            raise ValueError("SVG support requires qrcode[svg]. Install with: pip install qrcode[svg]")
-    
-    elif output_format == "pdf":
-        # PDF format (generate as PNG first, then convert)
-        from PIL import Image
-        img = qr.make_image(fill_color=fill_color, back_color=back_color)
-        # Resize if needed
-        if size != 300:
-            img = img.resize((size, size), Image.Resampling.LANCZOS)
-        
-        # For PDF, we'll return PNG for now (PDF conversion requires reportlab)
+        content_type = "image/svg+xml"
+        extension = "svg"
+    else:
+        # PDF is returned as PNG for now (PDF conversion requires reportlab)
         # In production, you could add PDF support
-        img.save(output, format="PNG")
         content_type = "image/png"
         extension = "png"
     
-    else:  # png
-        img = qr.make_image(fill_color=fill_color, back_color=back_color)
-        # Resize if needed
-        if size != 300:
-            from PIL import Image
-            img = img.resize((size, size), Image.Resampling.LANCZOS)
-        
-        img.save(output, format="PNG")
-        content_type = "image/png"
-        extension = "png"
-    
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    timestamp = _file_timestamp()
     filename = f"qrcode_{timestamp}.{extension}"
     
     return output.getvalue(), content_type, filename
@@ -137,11 +187,17 @@ def generate_qrcode(payload: dict) -> tuple[bytes, str, str]:
 # Add direct download endpoint for local testing
 fastapi_app = app.get_app()
 
+_MEDIA_TYPES = {
+    ".png": "image/png",
+    ".svg": "image/svg+xml",
+    ".pdf": "application/pdf",
+}
+
 @fastapi_app.get("/jobs/{job_id}/content")
 async def get_job_content(job_id: str):
     """Get job result content directly (for local testing with Azurite)."""
     from fastapi import HTTPException
-    from fastapi.responses import Response
+    from fastapi.responses import StreamingResponse
     from praisonai_svc.models import JobStatus
     
     job = await app.table_storage.get_job(job_id)
@@ -154,24 +210,13 @@ async def get_job_content(job_id: str):
     if not job.BlobName:
         raise HTTPException(status_code=500, detail="Blob name not found")
     
-    # Download blob content directly
-    blob_client = app.blob_storage.client.get_blob_client(
-        container=app.blob_storage.container_name,
-        blob=job.BlobName
-    )
-    content = blob_client.download_blob().readall()
-    
     # Determine content type from filename
-    if job.BlobName.endswith('.png'):
-        media_type = "image/png"
-    elif job.BlobName.endswith('.svg'):
-        media_type = "image/svg+xml"
-    elif job.BlobName.endswith('.pdf'):
-        media_type = "application/pdf"
-    else:
-        media_type = "application/octet-stream"
+    extension = os.path.splitext(job.BlobName)[1].lower()
+    media_type = _MEDIA_TYPES.get(extension, "application/octet-stream")
     
-    return Response(content=content, media_type=media_type)
+    # Stream blob content directly, one chunk at a time
+    chunks = await app.blob_storage.open_blob_chunks(job.BlobName)
+    return StreamingResponse(chunks, media_type=media_type)
 
 
 if __name__ == "__main__":
@@ -1,28 +1,45 @@
 """Main ServiceApp class for creating PraisonAI services."""
 
 import uuid
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any
 
 from fastapi import FastAPI, HTTPException
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, ValidationError
 
 from praisonai_svc.azure import BlobStorage, QueueManager, TableStorage
 from praisonai_svc.models import JobRequest, JobResponse, JobStatus
 from praisonai_svc.models.config import ServiceConfig
 from praisonai_svc.models.job import JobEntity
 
+# Job handlers return (file_data, content_type, filename), directly or from a coroutine
+JobResult = tuple[bytes, str, str]
+JobHandler = Callable[[dict[str, Any]], JobResult | Awaitable[JobResult]]
+
 
 class ServiceApp:
     """Main application class for PraisonAI services."""
 
-    def __init__(self, service_name: str, config: ServiceConfig | None = None) -> None:
-        """Initialize service application."""
+    def __init__(
+        self,
+        service_name: str,
+        config: ServiceConfig | None = None,
+        payload_model: type[BaseModel] | None = None,
+    ) -> None:
+        """Initialize service application.
+
+        If ``payload_model`` is given, ``POST /jobs`` validates each payload
+        against it (rejecting bad ones with 422 before they are queued) and
+        enqueues the validated payload, defaults included.
+        """
         self.service_name = service_name
         self.config = config or ServiceConfig()
+        self.payload_model = payload_model
         self.app = FastAPI(title=f"{service_name} API", version="1.0.0")
-        self.job_handler: Callable[[dict[str, Any]], tuple[bytes, str, str]] | None = None
+        self.job_handler: JobHandler | None = None
 
         # Initialize Azure clients
         self.blob_storage = BlobStorage(self.config)
@@ -56,6 +73,18 @@ class ServiceApp:
         @self.app.post("/jobs", response_model=JobResponse)
         async def create_job(request: JobRequest) -> JobResponse:
             """Create a new job."""
+            if self.payload_model is not None:
+                try:
+                    payload = self.payload_model.model_validate(request.payload)
+                except ValidationError as e:
+                    raise RequestValidationError(
+                        [
+                            {**error, "loc": ("body", "payload", *error["loc"])}
+                            for error in e.errors(include_url=False)
+                        ]
+                    ) from e
+                request.payload = payload.model_dump(mode="json")
+
             # Check for duplicate job by hash
             job_hash = request.compute_hash()
             existing_job = await self.table_storage.find_job_by_hash(job_hash)
@@ -110,12 +139,11 @@ class ServiceApp:
             download_url = self.blob_storage.generate_sas_url(job.BlobName)
             return {"download_url": download_url}
 
-    def job(
-        self, func: Callable[[dict[str, Any]], tuple[bytes, str, str]]
-    ) -> Callable[[dict[str, Any]], tuple[bytes, str, str]]:
+    def job(self, func: JobHandler) -> JobHandler:
         """Decorator to register job handler.
 
         Handler should return: (file_data, content_type, filename)
+        Handlers may also be ``async def`` functions; the worker awaits them.
         """
         self.job_handler = func
         return func
@@ -124,12 +152,17 @@ class ServiceApp:
         """Get FastAPI application instance."""
         return self.app
 
-    def run(self, host: str = "0.0.0.0", port: int = 8080) -> None:
+    def run(self, host: str = "0.0.0.0", port: int = 8080, **uvicorn_options: Any) -> None:
         """Run the service with both API and worker.
         
         This starts:
         1. Worker in a background thread
         2. FastAPI server in the main thread
+
+        Extra keyword arguments are passed to ``uvicorn.run``, e.g.
+        ``loop="uvloop", http="httptools"`` to require the C event loop and
+        HTTP parser. Uvicorn's default ``"auto"`` already picks them when
+        installed, as they are with ``uvicorn[standard]``.
         """
         import asyncio
         import threading
@@ -149,4 +182,4 @@ class ServiceApp:
 
         # Start API server in main thread
         print(f"✅ API server starting on http://{host}:{port}")
-        uvicorn.run(self.app, host=host, port=port)
+        uvicorn.run(self.app, host=host, port=port, **uvicorn_options)
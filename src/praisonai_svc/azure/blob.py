@@ -1,5 +1,7 @@
 """Azure Blob Storage integration with retry logic."""
 
+import asyncio
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime, timedelta
 
 from azure.storage.blob import BlobSasPermissions, BlobServiceClient, generate_blob_sas
@@ -40,6 +42,23 @@ class BlobStorage:
         blob_client.upload_blob(data, overwrite=True)
         return filename
 
+    async def open_blob_chunks(self, blob_name: str) -> AsyncIterator[bytes]:
+        """Start downloading a blob and return an iterator over its chunks.
+
+        The download is opened before returning, so a missing blob or storage
+        error raises here rather than after a streaming response has started.
+        Chunks are then read without blocking the event loop.
+        """
+        blob_client = self.client.get_blob_client(container=self.container_name, blob=blob_name)
+        downloader = await asyncio.to_thread(blob_client.download_blob)
+        return self._iter_chunks(downloader.chunks())
+
+    @staticmethod
+    async def _iter_chunks(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+        """Yield chunks from a blocking iterator, one worker thread hop each."""
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield chunk
+
     def generate_sas_url(self, blob_name: str, expiry_hours: int = 1) -> str:
         """Generate SAS URL for blob download."""
         sas_token = generate_blob_sas(
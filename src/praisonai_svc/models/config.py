@@ -32,6 +32,7 @@ class ServiceConfig(BaseSettings):
     # Worker settings
     worker_poll_interval_min: int = 1
     worker_poll_interval_max: int = 30
+    worker_processes: int = 0  # >0 runs sync job handlers in a process pool of this size
 
     @property
     def table_connection_string(self) -> str:
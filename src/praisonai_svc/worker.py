@@ -1,8 +1,12 @@
 """Worker module for processing jobs from queue."""
 
 import asyncio
+import inspect
 import json
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -29,6 +33,13 @@ class Worker:
         self.table_storage = TableStorage(config)
         self.running = False
 
+        # CPU-bound sync handlers run in separate processes to get past the GIL.
+        # Spawn rather than fork: the worker shares its process with uvicorn and
+        # Azure SDK threads, whose locks fork would copy in an unknown state.
+        self.process_pool: ProcessPoolExecutor | None = None
+        if config.worker_processes > 0:
+            self.process_pool = self._create_process_pool()
+
     async def poll_queue_with_backoff(self) -> None:
         """Poll queue with exponential backoff."""
         backoff = self.config.worker_poll_interval_min
@@ -39,12 +50,22 @@ class Worker:
 
         while self.running:
             try:
-                messages = await self.queue_manager.receive_messages(max_messages=1)
+                # Fetch enough messages to keep every pool process busy
+                # (Azure queues return at most 32 per call)
+                pooled = self._uses_process_pool()
+                messages = await self.queue_manager.receive_messages(
+                    max_messages=min(self.config.worker_processes, 32) if pooled else 1
+                )
 
                 if messages:
                     backoff = self.config.worker_poll_interval_min  # Reset on success
-                    for message in messages:
-                        await self._process_message(message)
+                    if pooled:
+                        await asyncio.gather(*(self._process_message(message) for message in messages))
+                    else:
+                        # In-process handlers share this process's global state
+                        # (e.g. matplotlib rcParams), so they run one at a time
+                        for message in messages:
+                            await self._process_message(message)
                 else:
                     await asyncio.sleep(backoff)
                     backoff = min(backoff * 2, max_backoff)  # Exponential increase
@@ -54,6 +75,17 @@ class Worker:
                 logger.error(f"Worker error: {e}")
                 await asyncio.sleep(backoff)
 
+    def _create_process_pool(self) -> ProcessPoolExecutor:
+        """Create the process pool for sync job handlers."""
+        return ProcessPoolExecutor(
+            max_workers=self.config.worker_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def _uses_process_pool(self) -> bool:
+        """Whether jobs run in the process pool (sync handlers only)."""
+        return self.process_pool is not None and not inspect.iscoroutinefunction(self.job_handler)
+
     async def _process_message(self, message: Any) -> None:
         """Process a single queue message."""
         try:
@@ -99,7 +131,26 @@ class Worker:
 
             # Execute job handler
             try:
-                file_data, content_type, filename = self.job_handler(payload)
+                if self._uses_process_pool():
+                    pool = self.process_pool
+                    loop = asyncio.get_running_loop()
+                    try:
+                        result = await loop.run_in_executor(pool, self.job_handler, payload)
+                    except BrokenProcessPool as e:
+                        # A pool process died (e.g. OOM kill or a crash in native
+                        # code), which breaks the whole pool. Replace it once for
+                        # all jobs that were in it, and leave this message on the
+                        # queue so the normal retry and poison-queue path applies.
+                        logger.error(f"Job {job_id} lost its pool process, leaving it for retry: {e}")
+                        if self.process_pool is pool:
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            self.process_pool = self._create_process_pool()
+                        return
+                else:
+                    result = self.job_handler(payload)
+                    if inspect.isawaitable(result):
+                        result = await result
+                file_data, content_type, filename = result
 
                 # Upload to blob storage
                 blob_name = f"{job_id}/{filename}"
@@ -133,6 +184,8 @@ class Worker:
     def stop(self) -> None:
         """Stop the worker."""
         self.running = False
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
         logger.info("Worker stopped")
 
 
@@ -74,3 +74,22 @@ def test_get_app(app_with_mocks):
     fastapi_app = app_with_mocks.get_app()
     assert fastapi_app is not None
     assert hasattr(fastapi_app, "routes")
+
+
+def test_run_forwards_uvicorn_options(app_with_mocks):
+    """Test run passes extra options through to uvicorn."""
+
+    @app_with_mocks.job
+    def test_handler(payload: dict) -> tuple[bytes, str, str]:
+        return b"test", "text/plain", "test.txt"
+
+    with (
+        patch("threading.Thread") as mock_thread,
+        patch("uvicorn.run") as mock_uvicorn_run,
+    ):
+        app_with_mocks.run(host="127.0.0.1", port=9000, loop="uvloop", http="httptools")
+
+    mock_thread.return_value.start.assert_called_once()
+    mock_uvicorn_run.assert_called_once_with(
+        app_with_mocks.app, host="127.0.0.1", port=9000, loop="uvloop", http="httptools"
+    )
@@ -0,0 +1,45 @@
+"""Test Azure storage helpers."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from azure.core.exceptions import ResourceNotFoundError
+
+from praisonai_svc.azure import BlobStorage
+from praisonai_svc.models.config import ServiceConfig
+
+
+async def test_open_blob_chunks():
+    """Test blob content is streamed chunk by chunk."""
+    config = MagicMock(spec=ServiceConfig)
+    config.azure_storage_connection_string = "mock"
+    config.blob_container_name = "test-container"
+
+    with patch("praisonai_svc.azure.blob.BlobServiceClient") as mock_service:
+        storage = BlobStorage(config)
+
+    blob_client = mock_service.from_connection_string.return_value.get_blob_client.return_value
+    blob_client.download_blob.return_value.chunks.return_value = iter([b"abc", b"def"])
+
+    chunks = [chunk async for chunk in await storage.open_blob_chunks("job-1/out.txt")]
+
+    assert chunks == [b"abc", b"def"]
+    mock_service.from_connection_string.return_value.get_blob_client.assert_called_with(
+        container="test-container", blob="job-1/out.txt"
+    )
+
+
+async def test_open_blob_chunks_raises_before_streaming():
+    """Test a failed download raises when opened, not while streaming."""
+    config = MagicMock(spec=ServiceConfig)
+    config.azure_storage_connection_string = "mock"
+    config.blob_container_name = "test-container"
+
+    with patch("praisonai_svc.azure.blob.BlobServiceClient") as mock_service:
+        storage = BlobStorage(config)
+
+    blob_client = mock_service.from_connection_string.return_value.get_blob_client.return_value
+    blob_client.download_blob.side_effect = ResourceNotFoundError("The specified blob does not exist.")
+
+    with pytest.raises(ResourceNotFoundError):
+        await storage.open_blob_chunks("job-1/missing.txt")
@@ -0,0 +1,170 @@
+"""Test example service handlers."""
+
+import asyncio
+import importlib.util
+import io
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from azure.core.exceptions import ResourceNotFoundError
+from fastapi.testclient import TestClient
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+
+
+def load_example(name, monkeypatch):
+    """Import an example's app.py with mocked Azure clients."""
+    monkeypatch.setenv("PRAISONAI_AZURE_STORAGE_CONNECTION_STRING", "mock")
+    spec = importlib.util.spec_from_file_location(
+        f"example_{name.replace('-', '_')}", EXAMPLES_DIR / name / "app.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    with (
+        patch("praisonai_svc.app.BlobStorage"),
+        patch("praisonai_svc.app.QueueManager"),
+        patch("praisonai_svc.app.TableStorage"),
+    ):
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def chart_app(monkeypatch):
+    """Chart generator example module."""
+    pytest.importorskip("matplotlib")
+    image = pytest.importorskip("PIL.Image")
+    return load_example("chart-generator", monkeypatch), image
+
+
+def test_chart_png_keeps_artists_past_figure_edge(chart_app):
+    """Test an over-wide title widens the PNG like savefig(bbox_inches='tight')."""
+    chart, image = chart_app
+    options = {"title": "A very long chart title " * 6, "width": 6}
+
+    png = chart.create_chart({"labels": ["a", "b"], "values": [1, 2]}, "bar", options)
+
+    # The figure itself is 600 px wide; the title reaches past both edges
+    assert image.open(io.BytesIO(png.getvalue())).width > 600
+
+
+def test_content_endpoint_fails_before_streaming(chart_app):
+    """Test a failed blob download gives an error status, not an empty 200."""
+    chart, _ = chart_app
+    job = MagicMock(Status="done", BlobName="job-1/chart.png")
+    chart.app.table_storage.get_job = AsyncMock(return_value=job)
+    chart.app.blob_storage.open_blob_chunks = AsyncMock(side_effect=ResourceNotFoundError("missing"))
+
+    client = TestClient(chart.fastapi_app, raise_server_exceptions=False)
+    response = client.get("/jobs/job-1/content")
+
+    assert response.status_code == 500
+
+
+def test_contract_cache_key_handles_big_integers(monkeypatch):
+    """Test descriptions with integers past 64 bits still render and cache."""
+    for module in ("jinja2", "orjson", "yaml"):
+        pytest.importorskip(module)
+    contract = load_example("api-contract-generator", monkeypatch)
+    api = {
+        "name": "Big API",
+        "endpoints": [{"method": "POST", "path": "/ids", "body_example": {"id": 2**70}}],
+    }
+
+    first = asyncio.run(contract.generate_contract({"api": api, "format": "docs"}))
+    second = asyncio.run(contract.generate_contract({"api": api, "format": "docs"}))
+
+    assert str(2**70).encode() in first[0]
+    assert second[0] is first[0]
+
+
+@pytest.mark.parametrize("body_example", [{"id": 2**70}, {"name": "\ud800"}])
+def test_postman_collection_handles_values_orjson_rejects(monkeypatch, body_example):
+    """Test Postman body examples with big integers or lone surrogates are encoded."""
+    for module in ("jinja2", "orjson", "yaml"):
+        pytest.importorskip(module)
+    contract = load_example("api-contract-generator", monkeypatch)
+    api = {
+        "name": "Big API",
+        "endpoints": [{"method": "POST", "path": "/ids", "body_example": body_example}],
+    }
+
+    file_data, content_type, _ = asyncio.run(contract.generate_contract({"api": api, "format": "postman"}))
+
+    collection = json.loads(file_data)
+    assert content_type == "application/json"
+    assert json.loads(collection["item"][0]["request"]["body"]["raw"]) == body_example
+
+
+def test_chart_unknown_styles_share_default_params(chart_app):
+    """Test arbitrary style strings do not grow the style cache."""
+    chart, _ = chart_app
+
+    for style in ("neon", "retro", "default"):
+        chart.create_chart({"labels": ["a"], "values": [1]}, "bar", {"style": style})
+
+    assert set(chart._STYLE_PARAMS) == {"default"}
+
+
+def test_email_handler_validates_unvalidated_payloads(monkeypatch):
+    """Test payloads that skipped POST /jobs are validated and defaulted."""
+    pytest.importorskip("jinja2")
+    email = load_example("email-template-renderer", monkeypatch)
+
+    file_data, content_type, _ = email.render_email_template({"template": "Hi {{ name }}", "data": {"name": "Ann"}})
+
+    assert (file_data, content_type) == (b"Hi Ann", "text/html")
+    with pytest.raises(ValueError, match="template"):
+        email.render_email_template({"data": {}})
+
+
+def test_qrcode_size_below_module_count_uses_one_pixel_modules(monkeypatch):
+    """Test a size too small for the symbol still draws 1 px per module."""
+    pytest.importorskip("qrcode")
+    image = pytest.importorskip("PIL.Image")
+    qr = load_example("qr-code-generator", monkeypatch)
+    output = io.BytesIO()
+
+    qr._write_qrcode(output, "https://example.com", "png", 10, "M", 4, "#000000", "#FFFFFF")
+
+    # Version 2 symbol: 25 modules plus a 4-module border on each side
+    assert image.open(io.BytesIO(output.getvalue())).size == (33, 33)
+
+
+def test_image_cache_is_bounded_by_decoded_size(monkeypatch):
+    """Test the decoded image cache evicts by total bitmap size and skips huge images."""
+    image = pytest.importorskip("PIL.Image")
+    processor = load_example("image-processor", monkeypatch)
+    monkeypatch.setattr(processor, "IMAGE_CACHE_BYTES", 250)
+    monkeypatch.setattr(processor, "IMAGE_CACHE_MAX_ENTRY_BYTES", 200)
+
+    def decode(size, color):
+        output = io.BytesIO()
+        image.new("L", size, color).save(output, format="PNG")
+        image_bytes = output.getvalue()
+        return processor._decoded(image.open(io.BytesIO(image_bytes)), image_bytes)
+
+    decode((10, 10), 0)
+    decode((10, 10), 1)
+    decode((10, 10), 2)
+    decode((20, 20), 3)
+
+    # 100 bytes each: the oldest is evicted to stay within 250; 400 is never cached
+    assert processor._image_cache_bytes == 200
+    assert len(processor._IMAGE_CACHE) == 2
+
+
+def test_json_outputs_handle_lone_surrogates(monkeypatch):
+    """Test JSON output falls back to the stdlib encoder for text orjson rejects."""
+    pytest.importorskip("jinja2")
+    text = load_example("text-processor-service", monkeypatch)
+    email = load_example("email-template-renderer", monkeypatch)
+
+    text_data, _, _ = text.process_text({"text": "a\ud800", "operation": "uppercase", "format": "json"})
+    email_data, _, _ = email.render_email_template(
+        {"template": "{{ name }}", "data": {"name": "\ud800"}, "output_format": "json"}
+    )
+
+    assert json.loads(text_data)["original_text"] == "a\ud800"
+    assert json.loads(email_data)["body"] == "\ud800"
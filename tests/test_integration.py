@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from pydantic import BaseModel
 
 from praisonai_svc import ServiceApp
 from praisonai_svc.models.config import ServiceConfig
@@ -193,3 +194,32 @@ def test_idempotency_check(test_app):
 
     # Should not create new job
     mocks["table"].create_job.assert_not_called()
+
+
+class GreetingPayload(BaseModel):
+    """Payload model used to test request-boundary validation."""
+
+    name: str
+    greeting: str = "Hello"
+
+
+def test_payload_model_validation(mock_azure_services):
+    """Test payloads are validated against the service's payload model."""
+    config = MagicMock(spec=ServiceConfig)
+    config.cors_origins = ["*"]
+    app = ServiceApp("Test Service", config=config, payload_model=GreetingPayload)
+    client = TestClient(app.app)
+
+    response = client.post("/jobs", json={"payload": {"greeting": "Hi"}})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "payload", "name"]
+    mock_azure_services["queue"].enqueue_job.assert_not_called()
+
+    response = client.post("/jobs", json={"payload": {"name": "Ada"}})
+
+    assert response.status_code == 200
+    job_id = response.json()["job_id"]
+    mock_azure_services["queue"].enqueue_job.assert_called_once_with(
+        job_id, {"name": "Ada", "greeting": "Hello"}
+    )
@@ -0,0 +1,153 @@
+"""Test Worker job dispatch."""
+
+import asyncio
+import json
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from praisonai_svc.models import JobStatus
+from praisonai_svc.models.config import ServiceConfig
+from praisonai_svc.worker import Worker
+
+
+@pytest.fixture
+def mock_config():
+    """Mock ServiceConfig."""
+    config = MagicMock(spec=ServiceConfig)
+    config.max_retry_count = 3
+    config.max_job_duration_minutes = 10
+    config.worker_processes = 0
+    return config
+
+
+def make_worker(config, handler):
+    """Create a Worker with mocked Azure clients."""
+    with (
+        patch("praisonai_svc.worker.BlobStorage") as mock_blob,
+        patch("praisonai_svc.worker.QueueManager") as mock_queue,
+        patch("praisonai_svc.worker.TableStorage") as mock_table,
+    ):
+        worker = Worker(config, handler)
+
+    mock_blob.return_value.upload_blob = AsyncMock()
+    mock_blob.return_value.generate_sas_url.return_value = "https://example.com/file.txt"
+    mock_queue.return_value.delete_message = AsyncMock()
+    mock_table.return_value.update_job = AsyncMock()
+    mock_table.return_value.get_job = AsyncMock(return_value=None)
+    return worker
+
+
+def upper_handler(payload: dict) -> tuple[bytes, str, str]:
+    """Module-level handler, so it can be pickled into a pool process."""
+    return payload["text"].upper().encode(), "text/plain", "out.txt"
+
+
+def crash_or_upper_handler(payload: dict) -> tuple[bytes, str, str]:
+    """Module-level handler that kills its pool process when asked to."""
+    if payload.get("crash"):
+        os._exit(1)
+    return upper_handler(payload)
+
+
+def make_message(payload):
+    """Create a queue message for a job."""
+    message = MagicMock()
+    message.content = json.dumps({"job_id": "job-1", "payload": payload})
+    message.dequeue_count = 1
+    return message
+
+
+@pytest.mark.parametrize("is_async", [False, True])
+async def test_process_message_runs_handler(mock_config, is_async):
+    """Test sync and async job handlers are both executed and uploaded."""
+    if is_async:
+
+        async def handler(payload: dict) -> tuple[bytes, str, str]:
+            return payload["text"].encode(), "text/plain", "out.txt"
+
+    else:
+
+        def handler(payload: dict) -> tuple[bytes, str, str]:
+            return payload["text"].encode(), "text/plain", "out.txt"
+
+    worker = make_worker(mock_config, handler)
+
+    await worker._process_message(make_message({"text": "hello"}))
+
+    worker.blob_storage.upload_blob.assert_awaited_once_with(b"hello", "job-1/out.txt")
+    assert worker.table_storage.update_job.await_args.kwargs["status"] == JobStatus.DONE
+
+
+async def test_process_message_uses_process_pool(mock_config):
+    """Test sync job handlers run in the process pool when one is configured."""
+    mock_config.worker_processes = 1
+    worker = make_worker(mock_config, upper_handler)
+    assert worker.process_pool is not None
+
+    try:
+        await worker._process_message(make_message({"text": "hello"}))
+    finally:
+        worker.stop()
+
+    worker.blob_storage.upload_blob.assert_awaited_once_with(b"HELLO", "job-1/out.txt")
+    assert worker.table_storage.update_job.await_args.kwargs["status"] == JobStatus.DONE
+
+
+async def test_poll_runs_async_handlers_one_at_a_time(mock_config):
+    """Test async handlers are not run concurrently, even with a process pool."""
+    mock_config.worker_processes = 2
+    mock_config.worker_poll_interval_min = 0
+    mock_config.worker_poll_interval_max = 0
+    active = 0
+    max_active = 0
+
+    async def handler(payload: dict) -> tuple[bytes, str, str]:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return payload["text"].encode(), "text/plain", "out.txt"
+
+    worker = make_worker(mock_config, handler)
+    batches = [[make_message({"text": "a"}), make_message({"text": "b"})]]
+
+    async def receive_messages(max_messages):
+        if batches:
+            return batches.pop()
+        worker.running = False
+        return []
+
+    worker.queue_manager.receive_messages = receive_messages
+    try:
+        await worker.poll_queue_with_backoff()
+    finally:
+        worker.stop()
+
+    assert worker.blob_storage.upload_blob.await_count == 2
+    assert max_active == 1
+
+
+async def test_process_message_replaces_broken_process_pool(mock_config):
+    """Test a job that kills its pool process is left for retry and later jobs still run."""
+    mock_config.worker_processes = 1
+    worker = make_worker(mock_config, crash_or_upper_handler)
+    broken_pool = worker.process_pool
+
+    try:
+        await worker._process_message(make_message({"crash": True}))
+
+        worker.queue_manager.delete_message.assert_not_awaited()
+        statuses = [call.kwargs.get("status") for call in worker.table_storage.update_job.await_args_list]
+        assert JobStatus.ERROR not in statuses
+        assert worker.process_pool is not broken_pool
+
+        await worker._process_message(make_message({"text": "hello"}))
+    finally:
+        worker.stop()
+
+    worker.blob_storage.upload_blob.assert_awaited_once_with(b"HELLO", "job-1/out.txt")
+    assert worker.table_storage.update_job.await_args.kwargs["status"] == JobStatus.DONE
+    worker.queue_manager.delete_message.assert_awaited_once()